@@ -1,3 +1,6 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+import io
+import mmap
 from pathlib import Path
 import queue
 
@@ -8,6 +11,59 @@ from ezmsg.util.messages.axisarray import AxisArray
 from ezmsg.util.messages.util import replace
 
 
+# XDF channel_format -> numpy dtype. Strings stay object arrays; fixed-width unicode would
+#  copy-and-truncate on conversion and re-copy on every downstream concatenation.
+_FMT_TO_DTYPE = {
+    "float32": np.float32,
+    "double64": np.float64,
+    "int8": np.int8,
+    "int16": np.int16,
+    "int32": np.int32,
+    "int64": np.int64,
+    "string": object,
+}
+
+
+# Chunks from multiple streams are keyed by stream name, each value a (data, timestamps) pair.
+#  This is deliberately a plain builtin dict: the key set is fixed at iterator construction, and
+#  dict construction from a fixed-size loop is the cheapest per-chunk container CPython offers.
+MultiStreamMessage = dict[str, tuple[npt.NDArray, npt.NDArray]]
+
+
+class _MMapReader(io.RawIOBase):
+    """
+    Minimal read-only file object over an mmap, in the form pyxdf's `open_xdf` accepts.
+    Lets the OS demand-page the file instead of copying it wholesale through buffered stdio.
+    """
+
+    def __init__(self, mm: mmap.mmap):
+        self._mm = mm
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        data = self._mm.read(len(b))
+        n = len(data)
+        b[:n] = data
+        return n
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            return self._mm.read()
+        return self._mm.read(size)
+
+    def seek(self, pos: int, whence: int = io.SEEK_SET) -> int:
+        self._mm.seek(pos, whence)
+        return self._mm.tell()
+
+    def tell(self) -> int:
+        return self._mm.tell()
+
+
 class XDFIterator:
     def __init__(
         self,
@@ -19,6 +75,9 @@ class XDFIterator:
         start_time: float | None = None,
         stop_time: float | None = None,
         rezero: bool = True,
+        pyxdf_kwargs: dict | None = None,
+        use_mmap: bool = False,
+        prefetch: bool = False,
     ):
         """
         An Iterator that yields chunks from an XDF.
@@ -32,8 +91,8 @@ class XDFIterator:
           all small. Thus, I use pyxdf.load_xdf which loads the entire raw data into memory. The processing is still
           done chunk-by-chunk.
         > Note2: It should be possible to start on chunk[ix+1] while chunk[ix] is still going through the pipeline.
-          Indeed, this is (optionally) how it works online. However, the overhead of setting this up for offline
-          analysis is not worth the gain, at least not at this stage.
+          Indeed, this is (optionally) how it works online. Pass `prefetch=True` to get a single-slot version of
+          this: a background thread extracts the next chunk while the caller processes the current one.
 
         Args:
             filepath: The path to the file to load and iterate over.
@@ -48,6 +107,24 @@ class XDFIterator:
                 rezero the timestamps to start at t=0.0 for simplicity. However, there may be rare circumstances where
                 one wants to compare the timestamps produced by ezmsg to timestamps produced by another XDF analysis
                 tool that does not rezero. In that case, set rezero=False.
+            pyxdf_kwargs: (Optional) Additional keyword arguments passed through to :func:`pyxdf.load_xdf`.
+                The per-stream regressions for `dejitter_timestamps`, `synchronize_clocks`, and
+                `handle_clock_resets` dominate load time for long files; pass e.g.
+                `{"dejitter_timestamps": False}` to skip them when raw timestamps are acceptable.
+                A `select_streams` entry (e.g. pyxdf's type-based queries, which name-based `select`
+                cannot express) is honored only when `select` is None; combining the two raises
+                ValueError. When forwarded together with rezero=True, t=0 is anchored at the earliest
+                timestamp among the streams it loads.
+                Note: when rezero is True, t=0 is anchored at the earliest timestamp across ALL streams in
+                the file, so a `select` subset still requires decoding every stream; set rezero=False if
+                load time of unselected streams is a concern.
+            use_mmap: Memory-map the file and hand the mapping to pyxdf instead of reading through
+                buffered stdio. This avoids duplicating the file contents between the page cache and
+                a Python buffer (roughly halving peak RSS on cold loads) and speeds up warm re-loads.
+                Ignored for gzip-compressed files (.xdfz / .xdf.gz), which fall back to the normal path.
+            prefetch: If True, extract chunk[ix+1] on a background thread while the caller is still
+                processing chunk[ix], so `__next__` usually returns an already-computed result. Iteration
+                order and contents are unchanged; leave False for strictly synchronous behavior.
         """
         if isinstance(filepath, str):
             filepath = Path(filepath).expanduser()
@@ -64,8 +141,58 @@ class XDFIterator:
             0  # File read header in seconds for previous iteration
         )
         self._time_range: tuple[float | None, float | None] = (start_time, stop_time)
+        self._pyxdf_kwargs = pyxdf_kwargs
+        self._use_mmap = use_mmap
+        self._pool = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        self._next_future: Future | None = None
         self._scan_file()
 
+    def _load_xdf(self) -> tuple[list[dict], dict]:
+        # When rezero is True we cannot let pyxdf skip unselected streams because t=0 is anchored at
+        #  the earliest timestamp across the whole file, and that minimum is only knowable after
+        #  clock correction (stream headers/footers carry uncorrected timestamps, so
+        #  pyxdf.resolve_streams cannot supply it). Unselected streams are dropped post-rezero.
+        kwargs = dict(self._pyxdf_kwargs) if self._pyxdf_kwargs else {}
+        if "select_streams" in kwargs:
+            # An explicit pyxdf-style selection (e.g. a type-based query that name-based
+            #  `select` cannot express) is forwarded as-is, but only when it cannot fight
+            #  with the iterator's own selection logic.
+            if self._select is not None:
+                raise ValueError(
+                    "Pass stream selection via `select` or "
+                    "pyxdf_kwargs['select_streams'], not both."
+                )
+            select_streams = kwargs.pop("select_streams")
+        else:
+            select_streams = (
+                None
+                if (self._select is None or self._rezero)
+                else [{"name": _} for _ in self._select]
+            )
+        if self._use_mmap:
+            b_compressed = self._filepath.suffix == ".xdfz" or self._filepath.suffixes[
+                -2:
+            ] == [".xdf", ".gz"]
+            if not b_compressed:
+                if isinstance(select_streams, list) and all(
+                    isinstance(elem, dict) for elem in select_streams
+                ):
+                    # load_xdf resolves dict queries by re-opening `filename`, which would read
+                    #  the mapping to EOF and then fail the magic-bytes check on the re-open.
+                    #  Resolve the query to integer stream ids from the path first; int ids skip
+                    #  that pass so the mapping is only read once.
+                    select_streams = pyxdf.match_streaminfos(
+                        pyxdf.resolve_streams(str(self._filepath)), select_streams
+                    )
+                    if not select_streams:  # match pyxdf.load_xdf's own error
+                        raise ValueError("No matching streams found.")
+                with open(self._filepath, "rb") as f:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        return pyxdf.load_xdf(
+                            _MMapReader(mm), select_streams=select_streams, **kwargs
+                        )
+        return pyxdf.load_xdf(self._filepath, select_streams=select_streams, **kwargs)
+
     def _scan_file(self):
         # Note: For larger datafiles we wouldn't want to load the entire thing into memory with load_xdf.
         #  Instead, get a file handle, then
@@ -76,22 +203,42 @@ class XDFIterator:
         #  However, we would need a custom file parser for that. For now, we load the relatively small
         #  file into memory simply with pyxdf.load_xdf then iterate over the items in memory
         #  at a user-defined chunk boundary (`chunk_dur`).
+        #  Load time itself is dominated by pyxdf's per-sample Python loop over Chunk-3 records.
+        #  Upstream has prototyped compiled (pybind11) and batched-struct readers with 4-15x
+        #  speedups, but nothing installable has shipped, and duplicating the format handling
+        #  (corruption recovery, clock sync, string streams) here is not worth the fork. Until a
+        #  compiled reader lands in pyxdf proper, `pyxdf_kwargs` (e.g. dejitter_timestamps=False)
+        #  and `use_mmap` are the available levers for load time.
         # Load xdf
-        self._streams, fileheader = pyxdf.load_xdf(
-            self._filepath,
-            select_streams=None
-            if (self._select is None or self._rezero)
-            else [{"name": _} for _ in self._select],
-        )
+        self._streams, fileheader = self._load_xdf()
         self._metadata = {}
         self._file_read_s = 0
         self._prev_file_read_s = 0
-        xdf_t0 = np.inf
-        xdf_tmax = 0
-        for strm in self._streams:
-            # Convert empty data to an array for easier slicing
+        n_streams = len(self._streams)
+        # Record each stream's first timestamp during the metadata pass (an O(1) read) and reduce
+        #  once below, rather than spending a dedicated Python loop per reduction.
+        first_ts = np.full(n_streams, np.inf)
+        for strm_ix, strm in enumerate(self._streams):
+            # Convert data to an array for easier slicing. pyxdf leaves string-format streams
+            #  (and their empty case) as lists; convert via the declared channel_format so they
+            #  come out as (time, channels) arrays with a deliberate dtype rather than np.array's
+            #  guess -- a bare np.array([]) is a shapeless float64 that defeats the dtype/shape
+            #  assumptions in template construction downstream.
             if type(strm["time_series"]) is list:
-                strm["time_series"] = np.array(strm["time_series"])
+                info = strm["info"]
+                n_ch = int(info["channel_count"][0])
+                dtype = _FMT_TO_DTYPE.get(info["channel_format"][0], object)
+                if len(strm["time_series"]) > 0:
+                    strm["time_series"] = np.asarray(
+                        strm["time_series"], dtype=dtype
+                    ).reshape(-1, n_ch)
+                else:
+                    strm["time_series"] = np.empty((0, n_ch), dtype=dtype)
+            else:
+                # Pay for any needed (time, channels) C-contiguous copy once here, so the slice
+                #  views handed out by `__next__` have the stride layout downstream consumers
+                #  expect and never trigger a second copy. No-op when already contiguous.
+                strm["time_series"] = np.ascontiguousarray(strm["time_series"])
 
             # Get more digestable metadata
             info = strm["info"]
@@ -106,37 +253,53 @@ class XDFIterator:
             # Update time range limits
             tvec = strm["time_stamps"]
             if len(tvec) > 0:
-                xdf_t0 = min(xdf_t0, tvec[0])
-                xdf_tmax = max(xdf_tmax, tvec[-1])
+                first_ts[strm_ix] = tvec[0]
+        xdf_t0 = first_ts.min() if n_streams > 0 else np.inf
 
         # Permanently modify streams' time stamps
         if self._rezero:
+            # Keep xdf_t0 a Python float so NumPy does not upcast during the subtraction.
+            xdf_t0 = float(xdf_t0)
             for strm in self._streams:
-                strm["time_stamps"] = strm["time_stamps"] - xdf_t0
-            xdf_tmax -= xdf_t0
+                ts = strm["time_stamps"]
+                if ts.flags.writeable and np.issubdtype(ts.dtype, np.floating):
+                    # Subtract in-place; a new array here would double the bytes moved
+                    #  for every high-rate stream just to shift its origin.
+                    np.subtract(ts, xdf_t0, out=ts)
+                else:
+                    strm["time_stamps"] = ts - xdf_t0
             xdf_t0 = 0
 
-        # Adjust for provided time bounds
-        for strm in self._streams:
+        # Adjust for provided time bounds, recording each stream's trimmed extent so the duration
+        #  reduction below does not need another pass over the streams.
+        last_ts = np.full(n_streams, -np.inf)
+        dur_adj = np.zeros(n_streams)
+        for strm_ix, strm in enumerate(self._streams):
             tvec = strm["time_stamps"]
             if len(tvec) > 0:
-                b_keep = np.ones(len(tvec), dtype=bool)
-                if self._time_range[0] is not None:
-                    b_keep = np.logical_and(b_keep, tvec >= self._time_range[0])
-                if self._time_range[1] is not None:
-                    b_keep = np.logical_and(b_keep, tvec <= self._time_range[1])
-                if np.any(~b_keep):
-                    strm["time_stamps"] = tvec[b_keep]
-                    strm["timeseries"] = strm["timeseries"][b_keep]
+                # Timestamps are monotonic so the kept range is contiguous; two searchsorted calls
+                #  replace the boolean mask and yield slice views instead of fancy-index copies.
+                lo = (
+                    np.searchsorted(tvec, self._time_range[0], side="left")
+                    if self._time_range[0] is not None
+                    else 0
+                )
+                hi = (
+                    np.searchsorted(tvec, self._time_range[1], side="right")
+                    if self._time_range[1] is not None
+                    else len(tvec)
+                )
+                if lo > 0 or hi < len(tvec):
+                    strm["time_stamps"] = tvec[lo:hi]
+                    strm["time_series"] = strm["time_series"][lo:hi]
+                    tvec = strm["time_stamps"]
+            if len(tvec) > 0:
+                srate = float(strm["info"]["nominal_srate"][0])
+                last_ts[strm_ix] = tvec[-1]
+                dur_adj[strm_ix] = (1 / srate if srate > 0 else 0) - xdf_t0
 
         # Recalculate tmax
-        xdf_dur = 0
-        for strm in self._streams:
-            tvec = strm["time_stamps"]
-            srate = float(strm["info"]["nominal_srate"][0])
-            adj = (1 / srate if srate > 0 else 0) - xdf_t0
-            if len(tvec) > 0:
-                xdf_dur = max(xdf_dur, tvec[-1] + adj)
+        xdf_dur = max((last_ts + dur_adj).max(), 0) if n_streams > 0 else 0
 
         # Chunking
         self._n_chunks = int(np.ceil(xdf_dur / self._chunk_dur))
@@ -144,10 +307,37 @@ class XDFIterator:
 
         # Drop streams that were not selected. (Could not drop earlier due to timestamp rezero)
         if self._rezero and self._select is not None:
-            stream_names = [_["info"]["name"][0] for _ in self._streams]
-            self._streams = [self._streams[stream_names.index(_)] for _ in self._select]
+            idx = {strm["info"]["name"][0]: ix for ix, strm in enumerate(self._streams)}
+            self._streams = [self._streams[idx[name]] for name in self._select]
             self._metadata = {k: self._metadata[k] for k in self._select}
 
+        # Timestamps in an XDF are monotonic per-stream, so `__next__` can find chunk boundaries with
+        #  O(log N) searchsorted and return zero-copy slice views instead of scanning a boolean mask
+        #  over the full timestamp vector for every chunk. Verify monotonicity once here; any stream
+        #  that violates it (e.g., a malformed file) falls back to the mask path.
+        self._b_monotonic: list[bool] = [
+            bool(np.all(np.diff(strm["time_stamps"]) >= 0)) for strm in self._streams
+        ]
+
+        # With monotonic timestamps, all chunk boundary indices can be computed up front with a
+        #  single vectorized searchsorted per stream; `__next__` then reduces to slice lookups.
+        edges = np.arange(self._n_chunks + 1) * self._chunk_dur + self._t0
+        self._chunk_bounds: dict[str, np.ndarray] = {}
+        for strm_ix, strm in enumerate(self._streams):
+            if self._b_monotonic[strm_ix]:
+                self._chunk_bounds[strm["info"]["name"][0]] = np.searchsorted(
+                    strm["time_stamps"], edges, side="left"
+                )
+
+        # Cache a structure-of-arrays view of the streams so the per-chunk loop in `__next__`
+        #  indexes flat lists instead of re-traversing each stream's nested info dict.
+        self._names: list[str] = [strm["info"]["name"][0] for strm in self._streams]
+        self._stream_index: dict[str, int] = {
+            name: ix for ix, name in enumerate(self._names)
+        }
+        self._times: list[np.ndarray] = [strm["time_stamps"] for strm in self._streams]
+        self._data: list[np.ndarray] = [strm["time_series"] for strm in self._streams]
+
         print(
             f"Imported {len(self._streams)} streams from {self._filepath} "
             f"spanning {xdf_dur:.2f} s beginning at t={xdf_t0:.2f}."
@@ -163,28 +353,69 @@ class XDFIterator:
 
     def __iter__(self):
         self._chunk_ix = 0
+        if self._pool is not None:
+            # Discard any in-flight prefetch for the previous position.
+            self._next_future = None
         return self
 
-    def __next__(self) -> dict[str, tuple[npt.NDArray, npt.NDArray]]:
+    def _compute_chunk(self, chunk_ix: int) -> tuple[MultiStreamMessage, float | None]:
+        """
+        Extract the chunk at `chunk_ix`. Pure with respect to iterator state so it can run on the
+        prefetch thread; the chunk's final timestamp is returned for `__next__` to fold into
+        `_last_time` at consumption time.
+        """
+        out_dict = {}
+        chunk_last: float | None = None
+        # Pre-bind attribute lookups as locals; LOAD_FAST in the per-stream loop is measurably
+        #  cheaper than repeated LOAD_ATTR chains at high chunk counts.
+        chunk_dur = self._chunk_dur
+        t_start = chunk_ix * chunk_dur + self._t0
+        t_stop = (chunk_ix + 1) * chunk_dur + self._t0
+        times = self._times
+        data = self._data
+        bounds_get = self._chunk_bounds.get
+        for strm_ix, name in enumerate(self._names):
+            ts = times[strm_ix]
+            bounds = bounds_get(name)
+            if bounds is not None:
+                i0, i1 = bounds[chunk_ix], bounds[chunk_ix + 1]
+                out_tvec = ts[i0:i1]
+                out_data = data[strm_ix][i0:i1]
+            else:
+                b_chunk = np.logical_and(ts >= t_start, ts < t_stop)
+                out_tvec = ts[b_chunk]
+                out_data = data[strm_ix][b_chunk]
+            out_dict[name] = (out_data, out_tvec)
+            if len(out_tvec) > 0:
+                chunk_last = (
+                    out_tvec[-1]
+                    if chunk_last is None
+                    else max(chunk_last, out_tvec[-1])
+                )
+        return out_dict, chunk_last
+
+    def __next__(self) -> MultiStreamMessage:
         if self._chunk_ix >= self.n_chunks:
             raise StopIteration
-        else:
-            out_dict = {}
-            t_start, t_stop = (
-                self._chunk_ix * self._chunk_dur + self._t0,
-                (self._chunk_ix + 1) * self._chunk_dur + self._t0,
-            )
-            for strm in self._streams:
-                b_chunk = np.logical_and(
-                    strm["time_stamps"] >= t_start, strm["time_stamps"] < t_stop
+        if self._pool is not None:
+            if self._next_future is None:
+                self._next_future = self._pool.submit(
+                    self._compute_chunk, self._chunk_ix
                 )
-                out_tvec = strm["time_stamps"][b_chunk]
-                out_data = strm["time_series"][b_chunk]
-                out_dict[strm["info"]["name"][0]] = (out_data, out_tvec)
-                if len(out_tvec) > 0:
-                    self._last_time = max(self._last_time, out_tvec[-1])
+            out_dict, chunk_last = self._next_future.result()
+            self._chunk_ix += 1
+            # Kick off extraction of the following chunk while the caller processes this one.
+            self._next_future = (
+                self._pool.submit(self._compute_chunk, self._chunk_ix)
+                if self._chunk_ix < self.n_chunks
+                else None
+            )
+        else:
+            out_dict, chunk_last = self._compute_chunk(self._chunk_ix)
             self._chunk_ix += 1
-            return out_dict
+        if chunk_last is not None:
+            self._last_time = max(self._last_time, chunk_last)
+        return out_dict
 
 
 def labels_from_strm(strm: dict) -> list[str]:
@@ -224,6 +455,22 @@ class XDFAxisArrayIterator(XDFIterator):
             },
             key=self._streams[0]["info"]["name"][0],
         )
+        # Cache the template's parts so `__next__` builds each message directly instead of
+        #  rebuilding the axes dict and nesting two `replace` calls per chunk.
+        self._time_axis = self._template.axes["time"]
+        self._ch_axis = self._template.axes["ch"]
+        self._empty_msg: AxisArray | None = None
+
+    def _make_msg(self, data: npt.NDArray, offset: float) -> AxisArray:
+        return AxisArray(
+            data=data,
+            dims=self._template.dims,
+            axes={
+                "time": replace(self._time_axis, offset=offset),
+                "ch": self._ch_axis,
+            },
+            key=self._template.key,
+        )
 
     def __next__(self) -> AxisArray:
         result: AxisArray | None = None
@@ -232,17 +479,17 @@ class XDFAxisArrayIterator(XDFIterator):
         for strm_name in self._select:
             if strm_name in chunk_dict:
                 data, tvec = chunk_dict[strm_name]
-                result = replace(
-                    self._template,
-                    data=data,
-                    axes={
-                        **self._template.axes,
-                        "time": replace(
-                            self._template.axes["time"],
-                            offset=tvec[0] if len(tvec) else self._last_time,
-                        ),
-                    },
-                )
+                if len(tvec) > 0:
+                    result = self._make_msg(data, tvec[0])
+                else:
+                    # Empty chunks are common during idle stretches (and never published by the
+                    #  unit); reuse the previous empty message while _last_time is unchanged.
+                    if (
+                        self._empty_msg is None
+                        or self._empty_msg.axes["time"].offset != self._last_time
+                    ):
+                        self._empty_msg = self._make_msg(data, self._last_time)
+                    result = self._empty_msg
         return result
 
 
@@ -260,12 +507,11 @@ class XDFMultiAxArrIterator(XDFIterator):
         """
         super().__init__(*args, **kwargs)
         self._force_single_sample = force_single_sample
-        stream_names = [_["info"]["name"][0] for _ in self._streams]
 
         # Create template messages for each stream
         self._templates = {}
         for stream_name, stream_meta in self._metadata.items():
-            stream = self._streams[stream_names.index(stream_name)]
+            stream = self._streams[self._stream_index[stream_name]]
             labels = labels_from_strm(stream)
             fs = stream_meta["nominal_srate"]
             self._templates[stream_name] = AxisArray(
@@ -287,34 +533,46 @@ class XDFMultiAxArrIterator(XDFIterator):
             for k, template in self._templates.items():
                 if k in chunk_dict and len(chunk_dict[k][1]) > 0:
                     data, tvec = chunk_dict[k]
+                    # Build messages directly from the template's cached parts; merging
+                    #  {**template.axes} and replacing the whole template costs two dataclass
+                    #  constructions and a dict copy per message.
+                    time_ax = template.axes["time"]
+                    ch_ax = template.axes["ch"]
                     if k in self._force_single_sample:
-                        for ix, _t in enumerate(tvec):
-                            self._pubqueue.put_nowait(
-                                replace(
-                                    template,
-                                    data=data[ix : ix + 1],
+                        # One message per sample. Split the chunk into single-row views up front
+                        #  (no copies) and hoist the loop-invariant template parts so the
+                        #  per-sample work is just one axis replace and one AxisArray.
+                        dims = template.dims
+                        key = template.key
+                        data_views = np.split(data, len(tvec))
+                        put_nowait = self._pubqueue.put_nowait
+                        for dview, _t in zip(data_views, tvec):
+                            put_nowait(
+                                AxisArray(
+                                    data=dview,
+                                    dims=dims,
                                     axes={
-                                        **template.axes,
-                                        "time": replace(
-                                            template.axes["time"], offset=_t
-                                        ),
+                                        "time": replace(time_ax, offset=float(_t)),
+                                        "ch": ch_ax,
                                     },
+                                    key=key,
                                 )
                             )
                     else:
                         self._pubqueue.put_nowait(
-                            replace(
-                                template,
+                            AxisArray(
                                 data=data,
+                                dims=template.dims,
                                 axes={
-                                    **template.axes,
                                     "time": replace(
-                                        template.axes["time"],
+                                        time_ax,
                                         offset=tvec[0]
                                         if len(tvec)
                                         else self._last_time,
                                     ),
+                                    "ch": ch_ax,
                                 },
+                                key=template.key,
                             )
                         )
         try:
@@ -17,6 +17,11 @@ class XDFIteratorSettings(ez.Settings):
     start_time: float | None = None
     stop_time: float | None = None
     rezero: bool = True
+    prefetch: bool = False
+    """
+    If True, the iterator extracts the next chunk on a background thread while the current chunk is
+    in the pipeline, so the publisher's `next` call usually finds the chunk already computed.
+    """
     self_terminating: bool = False
     """
     If True, the unit will raise a :obj:`ez.NormalTermination` exception when the file is exhausted.
@@ -45,6 +50,7 @@ class XDFIteratorUnit(ez.Unit):
             start_time=self.SETTINGS.start_time,
             stop_time=self.SETTINGS.stop_time,
             rezero=self.SETTINGS.rezero,
+            prefetch=self.SETTINGS.prefetch,
         )
 
     @ez.publisher(OUTPUT_SIGNAL)
@@ -88,6 +94,7 @@ class XDFMultiIteratorUnit(ez.Unit):
             start_time=self.SETTINGS.start_time,
             stop_time=self.SETTINGS.stop_time,
             rezero=self.SETTINGS.rezero,
+            prefetch=self.SETTINGS.prefetch,
             force_single_sample=self.SETTINGS.force_single_sample,
         )
 
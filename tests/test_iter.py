@@ -1,3 +1,130 @@
-def test_dummy():
-    # TODO: Add tests. Requires a small XDF source.
-    pass
+import struct
+
+import numpy as np
+import pytest
+
+from ezmsg.xdf.iter import XDFIterator
+
+EEG_FS = 32.0
+EEG_T0 = 1000.0
+EEG_N = 400
+MARKER_TIMES = [1000.5, 1003.25, 1003.3, 1009.0]
+
+
+def _chunk(tag: int, payload: bytes) -> bytes:
+    content = struct.pack("<H", tag) + payload
+    return bytes([4]) + struct.pack("<I", len(content)) + content
+
+
+def _samples_chunk(stream_id: int, stamps, rows: list[bytes]) -> bytes:
+    payload = struct.pack("<I", stream_id)
+    payload += bytes([4]) + struct.pack("<I", len(stamps))
+    for t, row in zip(stamps, rows):
+        payload += b"\x08" + struct.pack("<d", t) + row
+    return _chunk(3, payload)
+
+
+def _stream_header(name: str, typ: str, n_ch: int, srate: float, fmt: str) -> bytes:
+    return (
+        f'<?xml version="1.0"?><info><name>{name}</name><type>{typ}</type>'
+        f"<channel_count>{n_ch}</channel_count><nominal_srate>{srate:g}</nominal_srate>"
+        f"<channel_format>{fmt}</channel_format><desc /></info>"
+    ).encode()
+
+
+@pytest.fixture(scope="module")
+def xdf_path(tmp_path_factory):
+    """Write a small two-stream XDF file: 32 Hz float32 EEG plus irregular string markers."""
+    out = b"XDF:"
+    out += _chunk(1, b'<?xml version="1.0"?><info><version>1.0</version></info>')
+    out += _chunk(
+        2, struct.pack("<I", 1) + _stream_header("TestEEG", "EEG", 3, EEG_FS, "float32")
+    )
+    out += _chunk(
+        2,
+        struct.pack("<I", 2) + _stream_header("TestMarkers", "Markers", 1, 0, "string"),
+    )
+
+    rng = np.random.default_rng(42)
+    eeg_ts = EEG_T0 + np.arange(EEG_N) / EEG_FS
+    eeg = rng.standard_normal((EEG_N, 3)).astype(np.float32)
+    for i in range(0, EEG_N, 50):
+        rows = [eeg[j].tobytes() for j in range(i, min(i + 50, EEG_N))]
+        out += _samples_chunk(1, eeg_ts[i : i + 50], rows)
+    for j, t in enumerate(MARKER_TIMES):
+        s = f"event{j}".encode()
+        out += _samples_chunk(2, [t], [bytes([1, len(s)]) + s])
+
+    path = tmp_path_factory.mktemp("xdf") / "test.xdf"
+    path.write_bytes(out)
+    return path, eeg
+
+
+def _collect(it: XDFIterator) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+    out = {}
+    for chunk in it:
+        for name, (data, tvec) in chunk.items():
+            assert data.shape[0] == len(tvec)
+            if name in out:
+                out[name] = (
+                    np.concatenate([out[name][0], data]),
+                    np.concatenate([out[name][1], tvec]),
+                )
+            else:
+                out[name] = (data, tvec)
+    return out
+
+
+def test_iterates_all_samples(xdf_path):
+    path, eeg = xdf_path
+    streams = _collect(XDFIterator(path))
+    data, tvec = streams["TestEEG"]
+    assert data.shape == (EEG_N, 3)
+    assert np.array_equal(data, eeg)
+    assert np.allclose(tvec, np.arange(EEG_N) / EEG_FS)
+    mrk_data, mrk_tvec = streams["TestMarkers"]
+    assert mrk_data[:, 0].tolist() == [f"event{j}" for j in range(len(MARKER_TIMES))]
+    assert np.allclose(mrk_tvec, np.asarray(MARKER_TIMES) - EEG_T0)
+
+
+@pytest.mark.parametrize("rezero", [True, False])
+def test_time_range_trim(xdf_path, rezero):
+    path, eeg = xdf_path
+    offset = 0.0 if rezero else EEG_T0
+    t_start, t_stop = 2.0 + offset, 10.0 + offset
+    streams = _collect(
+        XDFIterator(path, start_time=t_start, stop_time=t_stop, rezero=rezero)
+    )
+    data, tvec = streams["TestEEG"]
+    assert len(tvec) > 0
+    assert tvec.min() >= t_start
+    assert tvec.max() <= t_stop
+    # Trimming must keep exactly the in-bounds samples of an untrimmed load...
+    full_data, full_tvec = _collect(XDFIterator(path, rezero=rezero))["TestEEG"]
+    b_keep = (full_tvec >= t_start) & (full_tvec <= t_stop)
+    assert np.array_equal(tvec, full_tvec[b_keep])
+    assert np.array_equal(data, full_data[b_keep])
+    # ...with data rows still aligned with their timestamps.
+    sample_ix = np.rint((tvec - offset) * EEG_FS).astype(int)
+    assert np.array_equal(data, eeg[sample_ix])
+    mrk_data, mrk_tvec = streams["TestMarkers"]
+    assert mrk_data[:, 0].tolist() == ["event1", "event2", "event3"]
+    assert np.all((mrk_tvec >= t_start) & (mrk_tvec <= t_stop))
+
+
+@pytest.mark.parametrize("rezero", [True, False])
+@pytest.mark.parametrize("select", [None, {"TestEEG"}])
+def test_use_mmap_matches_path_loader(xdf_path, select, rezero):
+    # select with rezero=False pushes a dict query into pyxdf.load_xdf, which used to re-open
+    #  (and thereby exhaust) the mmap wrapper and crash on the magic-bytes check.
+    path, _ = xdf_path
+    ref_it = XDFIterator(path, select=select, rezero=rezero)
+    mm_it = XDFIterator(path, select=select, rezero=rezero, use_mmap=True)
+    assert mm_it.stream_meta == ref_it.stream_meta
+    assert mm_it.n_chunks == ref_it.n_chunks
+    ref = _collect(ref_it)
+    out = _collect(mm_it)
+    assert set(out) == set(ref)
+    for name in ref:
+        assert np.array_equal(out[name][0], ref[name][0])
+        assert np.array_equal(out[name][1], ref[name][1])